@@ -9,20 +9,36 @@ Output layouts match what parakeet-rs expects:
   TDT: encoder-model.onnx, encoder-model.onnx.data, decoder_joint-model.onnx, vocab.txt
   CTC: model.onnx, model.onnx_data, tokenizer.json
 
-GPU export is attempted first. If VRAM is insufficient (GTX 1660 = 6GB, tight for
-0.6B models), the script falls back to CPU export automatically.
+Weights load (and optionally cast to fp16) on the GPU when available, but the
+ONNX trace itself runs on CPU by default: GPU-resident export is a known source
+of device-mismatch failures upstream and pins the whole trace under the VRAM
+ceiling (GTX 1660 = 6GB, tight for 0.6B models). --gpu-export opts back into
+GPU tracing, with automatic CPU fallback on OOM.
 """
 
 import argparse
+import contextlib
+import functools
+import gc
+import hashlib
 import json
+import mmap
+import multiprocessing
 import os
 import shutil
 import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import onnx
 import torch
-from onnx.external_data_helper import convert_model_to_external_data
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 MODELS = {
@@ -39,7 +55,282 @@ MODELS = {
 }
 
 
-def export_tdt_model(model, output_dir: Path):
+# Files a completed export must contain, per architecture
+EXPECTED_FILES = {
+    "tdt": [
+        "encoder-model.onnx",
+        "encoder-model.onnx.data",
+        "decoder_joint-model.onnx",
+        "vocab.txt",
+        "config.json",
+    ],
+    "ctc": [
+        "model.onnx",
+        "model.onnx_data",
+        "tokenizer.json",
+        "config.json",
+    ],
+}
+
+
+def write_json(path: Path, obj, indent: bool = True):
+    """Serialize JSON with orjson (C-level) when available.
+
+    json.dump with indent=2 runs Python-level formatting per element,
+    a visible stall for tokenizer.json with thousands of vocab entries.
+    Machine-read files pass indent=False to skip pretty-printing
+    entirely; writing bytes also skips text-mode encoding conversion.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        path.write_bytes(orjson.dumps(obj, option=option))
+    elif indent:
+        path.write_text(json.dumps(obj, indent=2))
+    else:
+        path.write_text(json.dumps(obj, separators=(",", ":")))
+
+
+def export_fingerprint(info: dict, precision: str) -> str:
+    """Cache key over everything that changes the exported files.
+
+    Stored in config.json as "_fingerprint"; a matching value plus a
+    complete set of output files means the export can be skipped.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        nemo_version = version("nemo_toolkit")
+    except PackageNotFoundError:
+        nemo_version = "unknown"
+
+    payload = {
+        "hf_id": info["hf_id"],
+        "nemo_version": nemo_version,
+        "precision": precision,
+        "attention": "rel_pos_local_attn:[128,128]",
+        "conv_chunking_factor": -1,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def export_is_current(output_dir: Path, arch: str, fingerprint: str) -> bool:
+    """Check whether output_dir holds a complete export for fingerprint."""
+    config_file = output_dir / "config.json"
+    if not config_file.exists():
+        return False
+    try:
+        config = json.loads(config_file.read_text())
+    except (OSError, json.JSONDecodeError):
+        return False
+    if config.get("_fingerprint") != fingerprint:
+        return False
+    return all(
+        (output_dir / name).exists() and (output_dir / name).stat().st_size > 0
+        for name in EXPECTED_FILES[arch]
+    )
+
+
+def write_external_data(
+    onnx_model, model_path: Path, data_path: Path, size_threshold: int = 1024
+):
+    """Stream initializer tensors into an external data file.
+
+    Replaces the onnx.save_model(save_as_external_data=True) path, which
+    re-serializes every tensor into a second full protobuf before writing.
+    Tensors at or above size_threshold are appended directly to data_path
+    and their protos rewritten to EXTERNAL references; raw_data is cleared
+    as each tensor is written, so peak memory stays near one graph parse
+    instead of ~3x the weight bytes. The remaining (small) graph is then
+    saved to model_path.
+
+    The default threshold matches ONNX Runtime's: small tensors (biases,
+    scales, under ~1 MB total) stay inline in the graph proto, so the
+    data file holds a few hundred large sequential writes instead of one
+    per initializer, and mmap locality at load time improves.
+
+    The file is sized up front with ftruncate and filled through mmap,
+    skipping the userspace-to-kernel copy of write() and leaving
+    all-zero tensors (padding channels, zero-initialized blocks) as
+    holes in a sparse file on filesystems that support them.
+    """
+    large_tensors = [
+        tensor
+        for tensor in onnx_model.graph.initializer
+        if tensor.HasField("raw_data") and len(tensor.raw_data) >= size_threshold
+    ]
+    offsets = []
+    total = 0
+    for tensor in large_tensors:
+        offsets.append(total)
+        total += len(tensor.raw_data)
+
+    with data_path.open("wb+") as f:
+        if total:
+            os.ftruncate(f.fileno(), total)
+            with mmap.mmap(f.fileno(), total) as mm:
+                for tensor, offset in zip(large_tensors, offsets):
+                    raw = tensor.raw_data
+                    length = len(raw)
+                    # ftruncate already made the region read back as
+                    # zeros, so an all-zero tensor stays a hole
+                    if raw.count(0) != length:
+                        mm[offset : offset + length] = raw
+                    tensor.ClearField("raw_data")
+                    tensor.data_location = onnx.TensorProto.EXTERNAL
+                    del tensor.external_data[:]
+                    for key, value in (
+                        ("location", data_path.name),
+                        ("offset", str(offset)),
+                        ("length", str(length)),
+                    ):
+                        entry = tensor.external_data.add()
+                        entry.key = key
+                        entry.value = value
+    onnx.save(onnx_model, str(model_path))
+
+
+def has_external_data(onnx_model) -> bool:
+    """True if any initializer already lives in an external data file."""
+    return any(
+        tensor.data_location == onnx.TensorProto.EXTERNAL
+        for tensor in onnx_model.graph.initializer
+    )
+
+
+def adopt_external_data(onnx_model, source_dir: Path, model_path: Path, data_path: Path):
+    """Publish an already-external export without reloading the weights.
+
+    When the export itself spills initializers past the 2 GB protobuf
+    limit, the weights are already on disk. A single spill file is
+    renamed into the layout parakeet-rs expects with only the location
+    entries rewritten; torch's per-tensor spill files (one per
+    initializer) are consolidated into the one expected .data file with
+    a chunked append, so the output layout is identical either way and
+    the expected-files cache check still holds.
+    """
+    locations = {
+        entry.value
+        for tensor in onnx_model.graph.initializer
+        if tensor.data_location == onnx.TensorProto.EXTERNAL
+        for entry in tensor.external_data
+        if entry.key == "location"
+    }
+    if len(locations) == 1:
+        # Single data file: rename and point every initializer at the
+        # new basename; no tensor bytes move at all.
+        os.replace(source_dir / next(iter(locations)), data_path)
+        for tensor in onnx_model.graph.initializer:
+            if tensor.data_location != onnx.TensorProto.EXTERNAL:
+                continue
+            for entry in tensor.external_data:
+                if entry.key == "location":
+                    entry.value = data_path.name
+    else:
+        # Per-tensor spill files: append each tensor's bytes to the
+        # single data file, rewriting offsets as we go. Chunked copy
+        # keeps peak memory flat regardless of tensor size.
+        with data_path.open("wb") as out:
+            for tensor in onnx_model.graph.initializer:
+                if tensor.data_location != onnx.TensorProto.EXTERNAL:
+                    continue
+                fields = {e.key: e.value for e in tensor.external_data}
+                src = source_dir / fields["location"]
+                src_offset = int(fields.get("offset", 0))
+                length = int(
+                    fields.get("length", src.stat().st_size - src_offset)
+                )
+                new_offset = out.tell()
+                with src.open("rb") as f:
+                    f.seek(src_offset)
+                    remaining = length
+                    while remaining:
+                        chunk = f.read(min(remaining, 64 * 1024 * 1024))
+                        if not chunk:
+                            break
+                        out.write(chunk)
+                        remaining -= len(chunk)
+                del tensor.external_data[:]
+                for key, value in (
+                    ("location", data_path.name),
+                    ("offset", str(new_offset)),
+                    ("length", str(length)),
+                ):
+                    entry = tensor.external_data.add()
+                    entry.key = key
+                    entry.value = value
+    onnx.save(onnx_model, str(model_path))
+
+
+def optimize_graph(onnx_model):
+    """Fold and fuse the NeMo graph before the external-data split.
+
+    NeMo exports carry redundant Constant nodes, unfused Conv+BN pairs,
+    and verbose LayerNorm decompositions that bloat the graph proto and
+    cost inference latency in parakeet-rs. Running onnxoptimizer while
+    the weights are still in-memory raw_data lets fused tensors go
+    external in the same single pass afterwards.
+
+    onnxoptimizer is optional; the export proceeds unoptimized when it
+    is missing or when the proto exceeds protobuf's 2 GB serialization
+    limit (the fp32 encoder on the CPU fallback path).
+    """
+    try:
+        import onnxoptimizer
+    except ImportError:
+        print("  onnxoptimizer not installed, skipping graph optimization")
+        return onnx_model
+
+    print("  Optimizing graph...")
+    passes = [
+        "eliminate_deadend",
+        "eliminate_identity",
+        "fuse_bn_into_conv",
+        "fuse_consecutive_transposes",
+        "fuse_add_bias_into_conv",
+    ]
+    try:
+        onnx_model = onnxoptimizer.optimize(onnx_model, passes)
+        onnx_model = onnx.shape_inference.infer_shapes(onnx_model, data_prop=True)
+    except (ValueError, RuntimeError) as e:
+        print(f"  Graph optimization skipped: {e}")
+    return onnx_model
+
+
+def remove_temp_dir(temp_dir: Path):
+    """Remove the export temp dir without a recursive tree walk.
+
+    The exporters know exactly which files they created, so unlink the
+    entries directly instead of paying shutil.rmtree's per-entry
+    scandir+lstat cost (noticeable on NFS and Docker overlay
+    filesystems). Falls back to rmtree if NeMo left a subdirectory.
+    """
+    try:
+        for entry in temp_dir.iterdir():
+            entry.unlink()
+        temp_dir.rmdir()
+    except OSError:
+        shutil.rmtree(temp_dir)
+
+
+def export_to_onnx(model, onnx_path: Path):
+    """Run NeMo's ONNX export with autograd fully disabled.
+
+    Tracing with autograd active allocates grad buffers for every
+    intermediate activation, roughly doubling trace-time VRAM and
+    needlessly triggering the OOM fallback on 6 GB cards. The cache
+    flush afterwards frees trace activations before the onnx.load stage
+    needs the memory.
+    """
+    model.eval()
+    for param in model.parameters():
+        param.requires_grad_(False)
+    with torch.inference_mode():
+        model.export(str(onnx_path))
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+def export_tdt_model(model, output_dir: Path, fingerprint: str = None):
     """Export a TDT model to ONNX with external data format.
 
     Creates:
@@ -49,55 +340,74 @@ def export_tdt_model(model, output_dir: Path):
       vocab.txt                  (token vocabulary with indices)
       config.json                (model metadata for parakeet-rs)
     """
-    temp_dir = output_dir / "temp"
-    temp_dir.mkdir(parents=True, exist_ok=True)
-
-    # NeMo export creates encoder-model.onnx and decoder_joint-model.onnx
-    print("  Exporting model to ONNX...")
-    model.export(str(temp_dir / "model.onnx"))
-
-    # Convert encoder to external data format (avoids 2GB protobuf limit)
-    print("  Converting encoder to external data format...")
-    encoder_file = temp_dir / "encoder-model.onnx"
-    if not encoder_file.exists():
-        print(f"  ERROR: Expected {encoder_file} but it doesn't exist")
-        print(f"  Files in temp dir: {list(temp_dir.iterdir())}")
-        sys.exit(1)
-
-    data_filename = "encoder-model.onnx.data"
-    onnx_model = onnx.load(str(encoder_file))
-    convert_model_to_external_data(
-        onnx_model,
-        all_tensors_to_one_file=True,
-        location=data_filename,
-        size_threshold=0,
-        convert_attribute=False,
-    )
-    onnx.save_model(
-        onnx_model,
-        str(output_dir / "encoder-model.onnx"),
-        save_as_external_data=True,
-        all_tensors_to_one_file=True,
-        location=data_filename,
-        size_threshold=0,
-    )
-
-    # Move decoder/joiner to final location
-    decoder_file = temp_dir / "decoder_joint-model.onnx"
-    if not decoder_file.exists():
-        print(f"  ERROR: Expected {decoder_file} but it doesn't exist")
-        print(f"  Files in temp dir: {list(temp_dir.iterdir())}")
-        sys.exit(1)
-    shutil.move(str(decoder_file), str(output_dir / "decoder_joint-model.onnx"))
-
-    # Clean up temp directory
-    shutil.rmtree(temp_dir)
+    # Keep the temp dir inside output_dir so publishing artifacts is a
+    # same-filesystem rename, never a byte copy (output_dir is often a
+    # bind mount while /tmp sits on overlayfs).
+    temp_dir = Path(tempfile.mkdtemp(prefix=".nemo_", dir=output_dir))
+
+    try:
+        # NeMo export creates encoder-model.onnx and decoder_joint-model.onnx
+        print("  Exporting model to ONNX...")
+        export_to_onnx(model, temp_dir / "model.onnx")
+
+        # Convert encoder to external data format (avoids 2GB protobuf limit)
+        print("  Converting encoder to external data format...")
+        encoder_file = temp_dir / "encoder-model.onnx"
+        if not encoder_file.exists():
+            print(f"  ERROR: Expected {encoder_file} but it doesn't exist")
+            print(f"  Files in temp dir: {list(temp_dir.iterdir())}")
+            sys.exit(1)
+
+        # load_external_data=False keeps already-spilled weights on disk
+        # instead of fusing them back into Python memory
+        onnx_model = onnx.load(str(encoder_file), load_external_data=False)
+        if has_external_data(onnx_model):
+            # Fusion passes need tensor values, so skip optimization here
+            adopt_external_data(
+                onnx_model,
+                encoder_file.parent,
+                output_dir / "encoder-model.onnx",
+                output_dir / "encoder-model.onnx.data",
+            )
+        else:
+            onnx_model = optimize_graph(onnx_model)
+            write_external_data(
+                onnx_model,
+                output_dir / "encoder-model.onnx",
+                output_dir / "encoder-model.onnx.data",
+            )
+
+        # Move decoder/joiner to final location
+        decoder_file = temp_dir / "decoder_joint-model.onnx"
+        if not decoder_file.exists():
+            print(f"  ERROR: Expected {decoder_file} but it doesn't exist")
+            print(f"  Files in temp dir: {list(temp_dir.iterdir())}")
+            sys.exit(1)
+        # Hardlink the artifact into place (same filesystem, see mkdtemp
+        # above) so the temp cleanup below doesn't race the publish
+        decoder_dest = output_dir / "decoder_joint-model.onnx"
+        try:
+            os.link(decoder_file, decoder_dest)
+        except OSError:
+            os.replace(decoder_file, decoder_dest)
+    except BaseException:
+        # A failed attempt (including sys.exit above) must not strand a
+        # partial multi-GB trace inside the published output dir; the
+        # fp32 retry starts over with a fresh temp dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+
+    # Clean up in the background while vocab/config emission (and, under
+    # --model all, the next model's load) proceeds. Non-daemon, so the
+    # interpreter waits for it at exit rather than leaving a stray dir.
+    threading.Thread(target=remove_temp_dir, args=(temp_dir,)).start()
 
     # Generate vocab.txt from model tokenizer
     print("  Generating vocab.txt...")
-    with (output_dir / "vocab.txt").open("w") as f:
-        for i, token in enumerate([*model.tokenizer.vocab, "<blk>"]):
-            f.write(f"{token} {i}\n")
+    lines = [
+        f"{token} {i}" for i, token in enumerate([*model.tokenizer.vocab, "<blk>"])
+    ]
+    (output_dir / "vocab.txt").write_text("\n".join(lines) + "\n")
 
     # Write config.json
     config = {
@@ -107,11 +417,12 @@ def export_tdt_model(model, output_dir: Path):
         "enable_local_attn": True,
         "conv_chunking_factor": -1,
     }
-    with (output_dir / "config.json").open("w") as f:
-        json.dump(config, f, indent=2)
+    if fingerprint:
+        config["_fingerprint"] = fingerprint
+    write_json(output_dir / "config.json", config)
 
 
-def export_ctc_model(model, output_dir: Path):
+def export_ctc_model(model, output_dir: Path, fingerprint: str = None):
     """Export a CTC model to ONNX with external data format.
 
     Creates:
@@ -120,65 +431,74 @@ def export_ctc_model(model, output_dir: Path):
       tokenizer.json       (HuggingFace-format tokenizer)
       config.json          (model metadata for parakeet-rs)
     """
-    temp_dir = output_dir / "temp"
-    temp_dir.mkdir(parents=True, exist_ok=True)
-
-    # NeMo export for CTC creates a single model.onnx (encoder + CTC head)
-    print("  Exporting model to ONNX...")
-    model.export(str(temp_dir / "model.onnx"))
-
-    # Find the exported ONNX file - CTC models produce a single file
-    # NeMo may name it model.onnx or encoder-model.onnx depending on version
-    exported_file = None
-    for candidate in ["model.onnx", "encoder-model.onnx"]:
-        if (temp_dir / candidate).exists():
-            exported_file = temp_dir / candidate
-            break
-
-    if exported_file is None:
-        print(f"  ERROR: No ONNX file found in {temp_dir}")
-        print(f"  Files: {list(temp_dir.iterdir())}")
-        sys.exit(1)
-
-    # Convert to external data format
-    print("  Converting to external data format...")
-    data_filename = "model.onnx_data"
-    onnx_model = onnx.load(str(exported_file))
-    convert_model_to_external_data(
-        onnx_model,
-        all_tensors_to_one_file=True,
-        location=data_filename,
-        size_threshold=0,
-        convert_attribute=False,
-    )
-    onnx.save_model(
-        onnx_model,
-        str(output_dir / "model.onnx"),
-        save_as_external_data=True,
-        all_tensors_to_one_file=True,
-        location=data_filename,
-        size_threshold=0,
-    )
-
-    # Clean up temp directory
-    shutil.rmtree(temp_dir)
+    # Same-filesystem temp dir; see export_tdt_model.
+    temp_dir = Path(tempfile.mkdtemp(prefix=".nemo_", dir=output_dir))
+
+    try:
+        # NeMo export for CTC creates a single model.onnx (encoder + CTC head)
+        print("  Exporting model to ONNX...")
+        export_to_onnx(model, temp_dir / "model.onnx")
+
+        # Find the exported ONNX file - CTC models produce a single file
+        # NeMo may name it model.onnx or encoder-model.onnx depending on version
+        exported_file = None
+        for candidate in ["model.onnx", "encoder-model.onnx"]:
+            if (temp_dir / candidate).exists():
+                exported_file = temp_dir / candidate
+                break
+
+        if exported_file is None:
+            print(f"  ERROR: No ONNX file found in {temp_dir}")
+            print(f"  Files: {list(temp_dir.iterdir())}")
+            sys.exit(1)
+
+        # Convert to external data format
+        print("  Converting to external data format...")
+        onnx_model = onnx.load(str(exported_file), load_external_data=False)
+        if has_external_data(onnx_model):
+            adopt_external_data(
+                onnx_model,
+                exported_file.parent,
+                output_dir / "model.onnx",
+                output_dir / "model.onnx_data",
+            )
+        else:
+            onnx_model = optimize_graph(onnx_model)
+            write_external_data(
+                onnx_model,
+                output_dir / "model.onnx",
+                output_dir / "model.onnx_data",
+            )
+    except BaseException:
+        # Failed attempts must not strand temp files in the published
+        # output dir; see export_tdt_model
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+
+    # Clean up in the background; see export_tdt_model
+    threading.Thread(target=remove_temp_dir, args=(temp_dir,)).start()
 
     # Generate tokenizer.json from model tokenizer
     print("  Generating tokenizer.json...")
     tokenizer = model.tokenizer
     # Build a HuggingFace-compatible tokenizer.json
-    vocab = {}
     if hasattr(tokenizer, "vocab"):
-        for i, token in enumerate(tokenizer.vocab):
-            vocab[token] = i
+        vocab = {token: i for i, token in enumerate(tokenizer.vocab)}
+    elif hasattr(tokenizer, "get_vocab"):
+        vocab = tokenizer.get_vocab()
     elif hasattr(tokenizer, "tokenizer") and hasattr(tokenizer.tokenizer, "get_vocab"):
         vocab = tokenizer.tokenizer.get_vocab()
     else:
-        # Fallback: iterate through token IDs
-        for i in range(tokenizer.vocab_size):
-            token = tokenizer.ids_to_tokens([i])
-            if token:
-                vocab[token[0]] = i
+        # Fallback: one batched ids_to_tokens call instead of a per-id
+        # round-trip through NeMo for every vocab entry
+        ids = list(range(tokenizer.vocab_size))
+        tokens = tokenizer.ids_to_tokens(ids)
+        vocab = {token: i for i, token in zip(ids, tokens) if token}
+
+    # Emit entries in id order: get_vocab() makes no ordering promise, and
+    # downstream loaders (tokenizers crate, parakeet-rs) build their
+    # tables in one pass when the input is already sorted
+    vocab = dict(sorted(vocab.items(), key=lambda kv: kv[1]))
 
     tokenizer_data = {
         "version": "1.0",
@@ -187,8 +507,7 @@ def export_ctc_model(model, output_dir: Path):
             "vocab": vocab,
         },
     }
-    with (output_dir / "tokenizer.json").open("w") as f:
-        json.dump(tokenizer_data, f, indent=2)
+    write_json(output_dir / "tokenizer.json", tokenizer_data, indent=False)
 
     # Write config.json
     config = {
@@ -198,17 +517,145 @@ def export_ctc_model(model, output_dir: Path):
         "enable_local_attn": True,
         "conv_chunking_factor": -1,
     }
-    with (output_dir / "config.json").open("w") as f:
-        json.dump(config, f, indent=2)
+    if fingerprint:
+        config["_fingerprint"] = fingerprint
+    write_json(output_dir / "config.json", config)
 
 
-def export_model(model_key: str, output_base: Path, device: str):
-    """Download and export a single model."""
+PRECISION_DTYPES = {
+    "fp16": torch.float16,
+    "bf16": torch.bfloat16,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def load_nemo_asr():
+    """Import nemo.collections.asr once per process.
+
+    The import alone takes several seconds (it drags in PyTorch
+    Lightning, Hydra and OmegaConf). Keeping it behind a cached loader
+    leaves --help and the fingerprint skip-path fast, and lets main warm
+    the import once before a multi-model run instead of hiding the cost
+    inside the first model's load time.
+    """
     import nemo.collections.asr as nemo_asr
 
+    return nemo_asr
+
+
+def int8_model_name(arch: str) -> str:
+    """Filename of the quantized encoder for an architecture."""
+    return "encoder-model.int8.onnx" if arch == "tdt" else "model.int8.onnx"
+
+
+def quantize_encoder(output_dir: Path, arch: str):
+    """Emit an int8 weight-quantized encoder beside the full-precision one.
+
+    Dynamic (weight-only) quantization of the MatMul/Gemm layers shrinks
+    the encoder ~4x and halves memory bandwidth at inference. Both files
+    are kept side by side; users pick by file name.
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    src = "encoder-model.onnx" if arch == "tdt" else "model.onnx"
+    dst = int8_model_name(arch)
+
+    print("  Quantizing to int8 (weight-only, MatMul/Gemm)...")
+    quantize_dynamic(
+        str(output_dir / src),
+        str(output_dir / dst),
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=["MatMul", "Gemm"],
+    )
+
+
+def validate_parity(model, output_dir: Path, arch: str, precision: str):
+    """Run the exported encoder once and compare against PyTorch.
+
+    Guards against corruption from the streaming external-data writer or
+    the optimizer passes at export time instead of at deploy time. A
+    short random feature batch through ORT on CPU costs a few seconds;
+    divergence beyond tolerance aborts the export.
+    """
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        print("  onnxruntime not installed, skipping parity check")
+        return
+
+    import numpy as np
+
+    encoder_name = "encoder-model.onnx" if arch == "tdt" else "model.onnx"
+    print("  Validating ONNX parity...")
+    sess = ort.InferenceSession(
+        str(output_dir / encoder_name), providers=["CPUExecutionProvider"]
+    )
+
+    # Fixed seed: a near-tolerance export must pass or fail the same way
+    # on every run
+    rng = np.random.default_rng(0)
+    feat = rng.standard_normal((1, 128, 200))
+    length = np.array([200], dtype=np.int64)
+    dtype_map = {"tensor(float)": np.float32, "tensor(float16)": np.float16}
+    feeds = {}
+    for inp in sess.get_inputs():
+        if "length" in inp.name.lower():
+            feeds[inp.name] = length
+        else:
+            feeds[inp.name] = feat.astype(dtype_map.get(inp.type, np.float32))
+    ort_out = sess.run(None, feeds)[0]
+
+    model = model.cpu()
+    feat_t = torch.from_numpy(feat).to(next(model.parameters()).dtype)
+    length_t = torch.from_numpy(length)
+    with torch.inference_mode():
+        if arch == "tdt":
+            # encoder-model.onnx holds only the encoder; the decoder and
+            # joiner live in decoder_joint-model.onnx
+            torch_out = model.encoder(audio_signal=feat_t, length=length_t)
+        else:
+            # model.onnx is the full encoder + CTC head, i.e. exactly
+            # what NeMo traces in forward_for_export
+            torch_out = model.forward_for_export(feat_t, length_t)
+    if isinstance(torch_out, (tuple, list)):
+        torch_out = torch_out[0]
+
+    max_abs_err = float(
+        np.max(np.abs(torch_out.float().numpy() - ort_out.astype(np.float32)))
+    )
+    tolerance = 1e-4 if precision == "fp32" else 1e-3
+    print(f"  Parity: max_abs_err={max_abs_err:.2e} (tolerance {tolerance:.0e})")
+    if max_abs_err > tolerance:
+        print("  ERROR: exported ONNX output diverges from PyTorch")
+        sys.exit(1)
+
+
+def export_model(
+    model_key: str,
+    output_base: Path,
+    device: str,
+    precision: str = "fp32",
+    force: bool = False,
+    quantize: str = "none",
+    gpu_export: bool = False,
+):
+    """Download and export a single model."""
     info = MODELS[model_key]
     output_dir = output_base / info["output_dir"]
 
+    if device != "cuda":
+        precision = "fp32"
+    fingerprint = export_fingerprint(info, precision)
+
+    if not force and export_is_current(output_dir, info["arch"], fingerprint):
+        print(f"\nSkipping {info['hf_id']}: export at {output_dir} is current")
+        print("  (use --force to re-export)")
+        # Quantization is additive and works from the on-disk model, so a
+        # cache hit must still produce the int8 file when it is missing
+        if quantize == "int8" and not (output_dir / int8_model_name(info["arch"])).exists():
+            quantize_encoder(output_dir, info["arch"])
+        return
+
     if output_dir.exists():
         shutil.rmtree(output_dir)
     output_dir.mkdir(parents=True)
@@ -217,6 +664,7 @@ def export_model(model_key: str, output_base: Path, device: str):
     print(f"  Output: {output_dir}")
 
     # Load model from HuggingFace
+    nemo_asr = load_nemo_asr()
     print(f"  Loading model (device={device})...")
     if device == "cuda":
         map_location = torch.device("cuda")
@@ -229,6 +677,14 @@ def export_model(model_key: str, output_base: Path, device: str):
 
     if device == "cuda":
         model = model.cuda()
+        if precision != "fp32":
+            # Halving the weights halves the encoder .onnx.data file and
+            # makes the 0.6B trace fit on 6 GB cards (GTX 1660).
+            dtype = PRECISION_DTYPES[precision]
+            print(f"  Casting model to {precision}...")
+            model = model.to(dtype)
+            for buf in model.buffers():
+                buf.data = buf.data.to(dtype)
     else:
         model = model.cpu()
 
@@ -237,17 +693,133 @@ def export_model(model_key: str, output_base: Path, device: str):
     model.change_attention_model("rel_pos_local_attn", [128, 128])
     model.change_subsampling_conv_chunking_factor(-1)
 
-    # Export based on architecture
-    if info["arch"] == "tdt":
-        export_tdt_model(model, output_dir)
+    # The GPU is only needed for the fast load and precision cast; the
+    # trace itself runs on CPU unless --gpu-export asked otherwise.
+    # Export-time device is independent of inference-time device, and CPU
+    # tracing sidesteps the device-mismatch failures GPU export is prone
+    # to, plus the VRAM ceiling.
+    trace_device = device
+    if device == "cuda" and not gpu_export:
+        print("  Moving model to CPU for the export trace...")
+        model = model.cpu()
+        torch.cuda.empty_cache()
+        trace_device = "cpu"
+
+    # Export based on architecture. Autocast covers NeMo ops that have no
+    # FP16 kernel during tracing; if the reduced-precision trace still
+    # fails, retry once in FP32 rather than losing the export.
+    if precision != "fp32":
+        autocast = torch.autocast(trace_device, dtype=PRECISION_DTYPES[precision])
     else:
-        export_ctc_model(model, output_dir)
-
-    # Print results
+        autocast = contextlib.nullcontext()
+
+    try:
+        with autocast:
+            if info["arch"] == "tdt":
+                export_tdt_model(model, output_dir, fingerprint)
+            else:
+                export_ctc_model(model, output_dir, fingerprint)
+    except torch.cuda.OutOfMemoryError:
+        # An fp32 retry needs twice the VRAM the fp16 trace just ran out
+        # of; the worker's cache-flush / CPU-fallback policy owns OOMs
+        raise
+    except RuntimeError:
+        if precision == "fp32":
+            raise
+        print(f"  {precision} export failed, retrying in fp32...")
+        model = model.float()
+        precision = "fp32"
+        fingerprint = export_fingerprint(info, precision)
+        if info["arch"] == "tdt":
+            export_tdt_model(model, output_dir, fingerprint)
+        else:
+            export_ctc_model(model, output_dir, fingerprint)
+
+    validate_parity(model, output_dir, info["arch"], precision)
+
+    if quantize == "int8":
+        quantize_encoder(output_dir, info["arch"])
+
+    # Print results. On Linux, DirEntry.stat() still costs one stat
+    # syscall per entry, but the result is cached so each file is
+    # statted at most once across the listing.
     print(f"\n  Export complete. Files:")
-    for f in sorted(output_dir.iterdir()):
-        size_mb = f.stat().st_size / (1024 * 1024)
-        print(f"    {f.name:40s} {size_mb:8.1f} MB")
+    with os.scandir(output_dir) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.name.startswith("."):
+                # temp dir may still be mid-cleanup in the background
+                continue
+            size_mb = entry.stat().st_size / (1024 * 1024)
+            print(f"    {entry.name:40s} {size_mb:8.1f} MB")
+
+
+def export_worker(
+    model_key: str,
+    output_base: Path,
+    cpu_only: bool,
+    precision: str,
+    force: bool = False,
+    quantize: str = "none",
+    gpu_export: bool = False,
+    gpu_index=None,
+):
+    """Export one model, deciding GPU vs CPU inside the worker.
+
+    Runs in its own process under --jobs > 1, so each worker owns its
+    CUDA context and can pin to a distinct GPU on multi-GPU hosts.
+    """
+    if gpu_index is not None and "CUDA_VISIBLE_DEVICES" not in os.environ:
+        # Must happen before the first torch.cuda call in this process
+        os.environ["CUDA_VISIBLE_DEVICES"] = str(gpu_index)
+
+    if not cpu_only and torch.cuda.is_available():
+        # Try GPU first, fall back to CPU on OOM
+        try:
+            print(f"\nAttempting GPU export for {model_key}...")
+            export_model(
+                model_key,
+                output_base,
+                device="cuda",
+                precision=precision,
+                force=force,
+                quantize=quantize,
+                gpu_export=gpu_export,
+            )
+            return
+        except torch.cuda.OutOfMemoryError:
+            # Lots of free VRAM at OOM time means fragmentation, not
+            # exhaustion; one retry after a cache flush often succeeds.
+            free, total = torch.cuda.mem_get_info()
+            print(
+                f"\n  GPU OOM ({free / 1024**3:.1f} GiB free "
+                f"of {total / 1024**3:.1f} GiB)"
+            )
+            torch.cuda.empty_cache()
+            gc.collect()
+            try:
+                print("  Retrying GPU export after cache flush...")
+                export_model(
+                    model_key,
+                    output_base,
+                    device="cuda",
+                    precision=precision,
+                    force=force,
+                    quantize=quantize,
+                    gpu_export=gpu_export,
+                )
+                return
+            except torch.cuda.OutOfMemoryError:
+                print(f"\n  GPU OOM again, falling back to CPU export...")
+                torch.cuda.empty_cache()
+
+    export_model(
+        model_key,
+        output_base,
+        device="cpu",
+        precision=precision,
+        force=force,
+        quantize=quantize,
+    )
 
 
 def main():
@@ -271,8 +843,51 @@ def main():
         action="store_true",
         help="Force CPU export (skip GPU attempt)",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-export even when the existing output is up to date",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Export models in N parallel processes. With --cpu-only the "
+        "ja and vi exports are independent and parallelize near-linearly; "
+        "on multi-GPU hosts each job pins to its own GPU. (default: 1)",
+    )
+    parser.add_argument(
+        "--precision",
+        choices=["fp32", "fp16", "bf16"],
+        default="fp16",
+        help="Weight precision for GPU export; halves file size and VRAM "
+        "at fp16/bf16. CPU export always uses fp32. (default: fp16)",
+    )
+    parser.add_argument(
+        "--gpu-export",
+        action="store_true",
+        help="Run the ONNX export trace on the GPU instead of moving the "
+        "model to CPU first. Faster when it works, but subject to the "
+        "VRAM ceiling and device-mismatch export bugs.",
+    )
+    parser.add_argument(
+        "--quantize",
+        choices=["none", "int8"],
+        default="none",
+        help="Also emit an int8 weight-quantized encoder (~4x smaller) "
+        "next to the full-precision files (default: none)",
+    )
     args = parser.parse_args()
 
+    # Expandable segments and a modest split size keep the caching
+    # allocator from fragmenting the 6 GB cards this runs on; must be set
+    # before the first CUDA call. setdefault so users can still override.
+    os.environ.setdefault(
+        "PYTORCH_CUDA_ALLOC_CONF",
+        "expandable_segments:True,max_split_size_mb:128,"
+        "garbage_collection_threshold:0.8",
+    )
+
     print(f"PyTorch version: {torch.__version__}")
     print(f"CUDA available: {torch.cuda.is_available()}")
     if torch.cuda.is_available():
@@ -282,26 +897,45 @@ def main():
 
     models_to_export = list(MODELS.keys()) if args.model == "all" else [args.model]
 
-    for model_key in models_to_export:
-        device = "cpu"
-
-        if not args.cpu_only and torch.cuda.is_available():
-            # Try GPU first, fall back to CPU on OOM
-            try:
-                print(f"\nAttempting GPU export for {model_key}...")
-                export_model(model_key, args.output, device="cuda")
-                continue
-            except (torch.cuda.OutOfMemoryError, RuntimeError) as e:
-                if "out of memory" in str(e).lower() or isinstance(
-                    e, torch.cuda.OutOfMemoryError
-                ):
-                    print(f"\n  GPU OOM, falling back to CPU export...")
-                    torch.cuda.empty_cache()
-                    device = "cpu"
-                else:
-                    raise
-
-        export_model(model_key, args.output, device=device)
+    if args.jobs > 1 and len(models_to_export) > 1:
+        # spawn: a forked child would inherit this process's CUDA state
+        gpu_count = 0 if args.cpu_only else torch.cuda.device_count()
+        pool = ProcessPoolExecutor(
+            max_workers=args.jobs,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        with pool:
+            futures = [
+                pool.submit(
+                    export_worker,
+                    model_key,
+                    args.output,
+                    args.cpu_only,
+                    args.precision,
+                    args.force,
+                    args.quantize,
+                    args.gpu_export,
+                    i % gpu_count if gpu_count else None,
+                )
+                for i, model_key in enumerate(models_to_export)
+            ]
+            for future in futures:
+                future.result()
+    else:
+        if len(models_to_export) > 1:
+            # Warm the NeMo import once up front rather than folding its
+            # several-second cost into the first model's load time
+            load_nemo_asr()
+        for model_key in models_to_export:
+            export_worker(
+                model_key,
+                args.output,
+                args.cpu_only,
+                args.precision,
+                args.force,
+                args.quantize,
+                args.gpu_export,
+            )
 
     print("\n=== All exports complete ===")
     print(f"Output directory: {args.output}")
@@ -309,9 +943,12 @@ def main():
         info = MODELS[model_key]
         model_dir = args.output / info["output_dir"]
         if model_dir.exists():
-            total_mb = sum(
-                f.stat().st_size for f in model_dir.iterdir()
-            ) / (1024 * 1024)
+            # Skip dot-entries: the last export's temp dir may still be
+            # mid-cleanup, and stat() on a vanishing entry would raise
+            with os.scandir(model_dir) as entries:
+                total_mb = sum(
+                    e.stat().st_size for e in entries if not e.name.startswith(".")
+                ) / (1024 * 1024)
             print(f"  {info['output_dir']}: {total_mb:.0f} MB total")
 
 